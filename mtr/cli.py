@@ -1,4 +1,5 @@
 import os
+import shlex
 import sys
 from datetime import datetime
 
@@ -46,6 +47,9 @@ servers:
     # download_dir: "./backups/dev-node"
   """
 
+# Encoded once: the template contains non-ASCII comments, so it is written as UTF-8 regardless of locale
+_DEFAULT_CONFIG_BYTES = DEFAULT_CONFIG_TEMPLATE.encode("utf-8")
+
 
 def _init_config():
     """Initialize .mtr/config.yaml in current directory."""
@@ -56,17 +60,31 @@ def _init_config():
         click.secho(f"Configuration already exists at {config_file}", fg="yellow")
         return
 
-    if not os.path.exists(mtr_dir):
+    try:
         os.makedirs(mtr_dir)
         click.echo(f"Created directory: {mtr_dir}")
+    except FileExistsError:
+        pass
 
-    with open(config_file, "w") as f:
-        f.write(DEFAULT_CONFIG_TEMPLATE)
+    with open(config_file, "wb") as f:
+        f.write(_DEFAULT_CONFIG_BYTES)
 
     click.secho(f"Created configuration: {config_file}", fg="green")
     click.echo("Please edit it to match your environment.")
 
 
+def _join_command(command) -> str:
+    """Join command arguments into the string executed by the remote shell.
+
+    A single argument is passed through verbatim so `mtr "make && ./run"` still works as a
+    shell snippet. Multiple arguments are shell-quoted, so values such as `-c "print('hi')"`
+    reach the remote program unchanged instead of being re-split by the remote shell.
+    """
+    if len(command) == 1:
+        return command[0]
+    return shlex.join(command)
+
+
 @click.command(context_settings=dict(ignore_unknown_options=True, allow_extra_args=True))
 @click.version_option(version=__version__, prog_name="mtr-cli", help="Show version and exit.")
 @click.option("-s", "--server", help="Target server alias")
@@ -97,17 +115,15 @@ def cli(
 ):
     """MTRemote: Sync and Execute code on remote server."""
 
-    # Check for updates (async, non-blocking)
+    # Check for updates (non-blocking: the PyPI request runs in a detached background process)
     update_message = None
-    if not no_check_update and not init:
+    # Dry runs only print what would happen: no update check (cache I/O, possible PyPI request)
+    if not no_check_update and not init and not dry_run:
         checker = UpdateChecker()
         # Try to get cached update message first (from previous check)
         update_message = checker.get_cached_update_message()
         # Trigger background check for next time
-        try:
-            checker.check()
-        except Exception:
-            pass  # Silently fail update check
+        checker.check_in_background()
 
     # Get logger instance (will be no-op if not setup)
     logger = get_logger()
@@ -143,19 +159,20 @@ def cli(
         click.echo(cli.get_help(click.get_current_context()))
         return
 
-    # Join command parts back into a string
-    remote_cmd = " ".join(command)
+    remote_cmd = _join_command(command)
 
-    logger.info(f"Starting mtr with command: {remote_cmd}", module="mtr.cli")
-    logger.debug(f"Options: server={server}, sync={sync}, dry_run={dry_run}, tty={tty}", module="mtr.cli")
+    logger.info("Starting mtr with command: %s", remote_cmd, module="mtr.cli")
+    logger.debug("Options: server=%s, sync=%s, dry_run=%s, tty=%s", server, sync, dry_run, tty, module="mtr.cli")
 
     # Check for interactive mode (TTY)
     # Interactive if: TTY is enabled by flag AND stdout is a real terminal
     is_interactive = tty and sys.stdout.isatty()
 
-    # Import rich if interactive
+    # Import rich if interactive. NO_COLOR / TERM=dumb only drop the rich UI (and its import cost);
+    # the remote command still gets a PTY.
+    use_rich = is_interactive and not os.environ.get("NO_COLOR") and os.environ.get("TERM") != "dumb"
     console = None
-    if is_interactive:
+    if use_rich:
         try:
             from rich.console import Console
 
@@ -167,9 +184,9 @@ def cli(
     try:
         loader = ConfigLoader()
         config = loader.load(server_name=server)
-        logger.info(f"Loaded configuration, target server: {config.target_server}", module="mtr.config")
+        logger.info("Loaded configuration, target server: %s", config.target_server, module="mtr.config")
     except ConfigError as e:
-        logger.error(f"Configuration error: {e}", module="mtr.config")
+        logger.error("Configuration error: %s", e, module="mtr.config")
         if console:
             console.print(f"[bold red]Configuration Error:[/bold red] {e}")
         else:
@@ -184,6 +201,9 @@ def cli(
     password = server_conf.get("password")
     remote_dir = server_conf.get("remote_dir")
     pre_cmd = server_conf.get("pre_cmd")
+    ssh_compress = server_conf.get("ssh_compress", False)
+    rsync_compress = server_conf.get("compress", True)
+    rsync_whole_file = server_conf.get("whole_file", False)
 
     if not host or not user:
         logger.error("Missing required config: host or user", module="mtr.cli")
@@ -195,7 +215,7 @@ def cli(
         sys.exit(1)
 
     auth_method = "key" if key_filename else ("password" if password else "none")
-    logger.info(f"Connecting to {host} as {user} (auth: {auth_method})", module="mtr.ssh")
+    logger.info("Connecting to %s as %s (auth: %s)", host, user, auth_method, module="mtr.ssh")
 
     if console:
         console.print(
@@ -241,12 +261,14 @@ def cli(
             port=port,
             exclude=exclude,
             respect_gitignore=respect_gitignore,
+            compress=rsync_compress,
+            whole_file=rsync_whole_file,
         )
 
         try:
             if dry_run:
                 click.echo(f"[DryRun] Would sync {local_dir} -> {remote_dir}")
-                logger.info(f"[DryRun] Would sync {local_dir} -> {remote_dir}", module="mtr.sync")
+                logger.info("[DryRun] Would sync %s -> %s", local_dir, remote_dir, module="mtr.sync")
             else:
                 if is_interactive and console:
                     # TTY mode: single line real-time update using Rich Live
@@ -271,9 +293,9 @@ def cli(
                     click.secho("Syncing code...", fg="blue")
                     syncer.sync(show_progress=True, progress_callback=show_sync_progress)
                     click.secho("Sync completed!", fg="green")
-                logger.info(f"Sync completed: {local_dir} -> {remote_dir}", module="mtr.sync")
+                logger.info("Sync completed: %s -> %s", local_dir, remote_dir, module="mtr.sync")
         except SyncError as e:
-            logger.error(f"Sync failed: {e}", module="mtr.sync")
+            logger.error("Sync failed: %s", e, module="mtr.sync")
             click.secho(f"Sync Failed: {e}", fg="red", err=True)
             sys.exit(1)
 
@@ -327,12 +349,14 @@ def cli(
             port=port,
             exclude=exclude,
             respect_gitignore=respect_gitignore,
+            compress=rsync_compress,
+            whole_file=rsync_whole_file,
         )
 
         try:
             if dry_run:
                 click.echo(f"[DryRun] Would download {remote_get_path} -> {local_dest}")
-                logger.info(f"[DryRun] Would download {remote_get_path} -> {local_dest}", module="mtr.sync")
+                logger.info("[DryRun] Would download %s -> %s", remote_get_path, local_dest, module="mtr.sync")
             else:
                 if is_interactive and console:
                     # TTY mode: single line real-time update using Rich Live
@@ -357,9 +381,9 @@ def cli(
                     click.secho(f"Downloading {remote_get_path}...", fg="blue")
                     syncer.download(remote_get_path, local_dest, show_progress=True, progress_callback=show_download_progress)
                     click.secho(f"Download completed: {local_dest}", fg="green")
-                logger.info(f"Download completed: {remote_get_path} -> {local_dest}", module="mtr.sync")
+                logger.info("Download completed: %s -> %s", remote_get_path, local_dest, module="mtr.sync")
         except SyncError as e:
-            logger.error(f"Download failed: {e}", module="mtr.sync")
+            logger.error("Download failed: %s", e, module="mtr.sync")
             click.secho(f"Download Failed: {e}", fg="red", err=True)
             sys.exit(1)
 
@@ -376,7 +400,7 @@ def cli(
 
     try:
         # Execute command via SSH
-        logger.info(f"Executing command: {remote_cmd}", module="mtr.cli")
+        logger.info("Executing command: %s", remote_cmd, module="mtr.cli")
         exit_code = run_ssh_command(
             host=host,
             user=user,
@@ -387,8 +411,9 @@ def cli(
             workdir=remote_dir,
             pre_cmd=pre_cmd,
             tty=is_interactive,
+            compress=ssh_compress,
         )
-        logger.info(f"Command completed with exit code: {exit_code}", module="mtr.cli")
+        logger.info("Command completed with exit code: %s", exit_code, module="mtr.cli")
 
         # Show update message if available
         if update_message:
@@ -396,7 +421,7 @@ def cli(
         sys.exit(exit_code)
 
     except SSHError as e:
-        logger.error(f"SSH error: {e}", module="mtr.ssh")
+        logger.error("SSH error: %s", e, module="mtr.ssh")
         click.secho(f"SSH Error: {e}", fg="red", err=True)
         # Show update message if available even on error
         if update_message:
@@ -1,9 +1,13 @@
+import json
 import os
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
 import yaml
 
+# Prefer the libyaml-backed loader; PyYAML wheels bundle it, but fall back to the pure-Python one if absent.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ConfigError(Exception):
     """Base exception for configuration errors."""
@@ -51,16 +55,48 @@ class ConfigLoader:
         # Fallback to local if neither exists (will fail later on read if needed, or we can handle it)
         return local_config
 
-    def load(self, server_name: Optional[str] = None) -> Config:
-        if not os.path.exists(self.config_path):
-            raise ConfigError(f"Configuration file not found at: {self.config_path}")
+    def _cache_path(self) -> str:
+        """Path of the JSON sidecar cache, e.g. .mtr/config.yaml -> .mtr/config.cache.json."""
+        return os.path.splitext(self.config_path)[0] + ".cache.json"
+
+    def _load_raw_config(self) -> Dict[str, Any]:
+        """Load the raw config dict, reusing the JSON sidecar cache while the YAML file is unchanged."""
+        st = os.stat(self.config_path)
+        source_key = [st.st_mtime_ns, st.st_size]
+        cache_path = self._cache_path()
+
+        try:
+            with open(cache_path, "r") as f:
+                cached = json.load(f)
+            if cached["source"] == source_key:
+                return cached["config"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # Missing, stale or corrupt cache: fall back to YAML
 
         try:
             with open(self.config_path, "r") as f:
-                raw_config = yaml.safe_load(f) or {}
+                raw_config = yaml.load(f, Loader=_YamlLoader) or {}
         except yaml.YAMLError as e:
             raise ConfigError(f"Failed to parse config file: {e}")
 
+        # Only cache configs that survive a JSON round-trip unchanged (e.g. no dates or non-string keys)
+        try:
+            payload = json.dumps({"source": source_key, "config": raw_config})
+            if json.loads(payload)["config"] == raw_config:
+                fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "w") as f:
+                    f.write(payload)
+        except (OSError, TypeError, ValueError):
+            pass  # Cache is best-effort
+
+        return raw_config
+
+    def load(self, server_name: Optional[str] = None) -> Config:
+        if not os.path.exists(self.config_path):
+            raise ConfigError(f"Configuration file not found at: {self.config_path}")
+
+        raw_config = self._load_raw_config()
+
         servers = raw_config.get("servers", {})
         if not servers:
             raise ConfigError("No servers defined in configuration.")
@@ -34,22 +34,26 @@ class _NoOpLogger:
     It provides the same interface as Logger but does nothing.
     """
 
-    def debug(self, message: str, module: str = "") -> None:
+    def debug(self, message: str, *args, module: str = "") -> None:
         """No-op debug log."""
         pass
 
-    def info(self, message: str, module: str = "") -> None:
+    def info(self, message: str, *args, module: str = "") -> None:
         """No-op info log."""
         pass
 
-    def warning(self, message: str, module: str = "") -> None:
+    def warning(self, message: str, *args, module: str = "") -> None:
         """No-op warning log."""
         pass
 
-    def error(self, message: str, module: str = "") -> None:
+    def error(self, message: str, *args, module: str = "") -> None:
         """No-op error log."""
         pass
 
+    def bind(self, module: str) -> "_NoOpLogger":
+        """Return self: binding a module to a no-op logger is still a no-op."""
+        return self
+
 
 class Logger:
     """Simple file-based logger."""
@@ -64,11 +68,17 @@ class Logger:
         self.log_file = log_file
         self.level = level
 
-    def _write(self, level: LogLevel, message: str, module: str = ""):
-        """Write log message to file if level is sufficient."""
+    def _write(self, level: LogLevel, message: str, args: tuple = (), module: str = ""):
+        """Write log message to file if level is sufficient.
+
+        ``args`` are %-formatted into ``message`` only when the message is actually written.
+        """
         if level.value < self.level.value:
             return
 
+        if args:
+            message = message % args
+
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         module_str = f"[{module}]" if module else ""
         log_line = f"[{timestamp}] [{level.name}] {module_str} {message}\n"
@@ -76,21 +86,49 @@ class Logger:
         with open(self.log_file, "a", encoding="utf-8") as f:
             f.write(log_line)
 
-    def debug(self, message: str, module: str = ""):
+    def debug(self, message: str, *args, module: str = ""):
+        """Log debug message."""
+        self._write(LogLevel.DEBUG, message, args, module)
+
+    def info(self, message: str, *args, module: str = ""):
+        """Log info message."""
+        self._write(LogLevel.INFO, message, args, module)
+
+    def warning(self, message: str, *args, module: str = ""):
+        """Log warning message."""
+        self._write(LogLevel.WARNING, message, args, module)
+
+    def error(self, message: str, *args, module: str = ""):
+        """Log error message."""
+        self._write(LogLevel.ERROR, message, args, module)
+
+    def bind(self, module: str) -> "_BoundLogger":
+        """Return a view of this logger that tags every message with ``module``."""
+        return _BoundLogger(self, module)
+
+
+class _BoundLogger:
+    """Logger view with a fixed module name, so call sites don't repeat ``module=...``."""
+
+    def __init__(self, logger: Logger, module: str):
+        self._logger = logger
+        self._module = module
+
+    def debug(self, message: str, *args):
         """Log debug message."""
-        self._write(LogLevel.DEBUG, message, module)
+        self._logger._write(LogLevel.DEBUG, message, args, self._module)
 
-    def info(self, message: str, module: str = ""):
+    def info(self, message: str, *args):
         """Log info message."""
-        self._write(LogLevel.INFO, message, module)
+        self._logger._write(LogLevel.INFO, message, args, self._module)
 
-    def warning(self, message: str, module: str = ""):
+    def warning(self, message: str, *args):
         """Log warning message."""
-        self._write(LogLevel.WARNING, message, module)
+        self._logger._write(LogLevel.WARNING, message, args, self._module)
 
-    def error(self, message: str, module: str = ""):
+    def error(self, message: str, *args):
         """Log error message."""
-        self._write(LogLevel.ERROR, message, module)
+        self._logger._write(LogLevel.ERROR, message, args, self._module)
 
 
 # Global logger instance
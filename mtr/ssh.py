@@ -1,12 +1,17 @@
 """SSH utilities for MTRemote."""
 
+import functools
 import os
 import shutil
 import subprocess
-from typing import Optional
+from typing import List, Optional
 
 from mtr.logger import get_logger
 
+# Directory for OpenSSH ControlMaster sockets. Kept unexpanded: ssh expands "~" itself,
+# and rsync splits its -e argument on whitespace, which an expanded home path may contain.
+CONTROL_DIR = "~/.cache/mtr/cm"
+
 
 class SSHError(Exception):
     """SSH-related errors."""
@@ -14,9 +19,15 @@ class SSHError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=None)
+def _which(cmd: str) -> Optional[str]:
+    """Cached shutil.which(): PATH does not change during a run."""
+    return shutil.which(cmd)
+
+
 def _check_ssh_availability():
     """Check if ssh command is available."""
-    if shutil.which("ssh") is None:
+    if _which("ssh") is None:
         raise SSHError(
             "SSH command not found. Please install OpenSSH client.\n"
             "  macOS: brew install openssh\n"
@@ -27,7 +38,7 @@ def _check_ssh_availability():
 
 def _check_sshpass_availability():
     """Check if sshpass command is available."""
-    if shutil.which("sshpass") is None:
+    if _which("sshpass") is None:
         raise SSHError(
             "sshpass command not found. Please install sshpass for password authentication.\n"
             "  macOS: brew install hudochenkov/sshpass/sshpass\n"
@@ -36,15 +47,45 @@ def _check_sshpass_availability():
         )
 
 
+def control_master_options() -> List[str]:
+    """SSH options that multiplex every connection to a host over one persistent master.
+
+    The rsync sync and the command execution that follows it then share a single
+    TCP connection and authentication instead of paying two full SSH handshakes.
+    """
+    return [
+        "-o",
+        "ControlMaster=auto",
+        "-o",
+        f"ControlPath={CONTROL_DIR}/%C",
+        "-o",
+        "ControlPersist=60s",
+    ]
+
+
+def ensure_control_dir() -> bool:
+    """Create the ControlMaster socket directory, private to the current user.
+
+    Returns False if it cannot be created (e.g. read-only or unusable HOME). Multiplexing is
+    only an optimisation, so callers then leave out control_master_options(): ssh exits 255
+    when it cannot bind the ControlPath.
+    """
+    try:
+        os.makedirs(os.path.expanduser(CONTROL_DIR), mode=0o700, exist_ok=True)
+    except OSError:
+        return False
+    return True
+
+
 def _build_command(command: str, workdir: Optional[str] = None, pre_cmd: Optional[str] = None) -> str:
     """Build the full command string with workdir and pre_cmd."""
-    parts = []
+    if workdir and pre_cmd:
+        return f"cd {workdir} && {pre_cmd} && {command}"
     if workdir:
-        parts.append(f"cd {workdir}")
+        return f"cd {workdir} && {command}"
     if pre_cmd:
-        parts.append(pre_cmd)
-    parts.append(command)
-    return " && ".join(parts)
+        return f"{pre_cmd} && {command}"
+    return command
 
 
 def run_ssh_command(
@@ -57,6 +98,7 @@ def run_ssh_command(
     workdir: Optional[str] = None,
     pre_cmd: Optional[str] = None,
     tty: bool = True,
+    compress: bool = False,
 ) -> int:
     """
     Run a command on remote host via system SSH.
@@ -71,6 +113,8 @@ def run_ssh_command(
         workdir: Working directory on remote host
         pre_cmd: Command to run before main command
         tty: If True, use ssh -t for TTY allocation
+        compress: If True, enable SSH compression (ssh -C). Saves bandwidth for text-heavy
+            output on slow links at the cost of CPU; not worth it for interactive use on a LAN
 
     Returns:
         Exit code from the remote command
@@ -78,10 +122,10 @@ def run_ssh_command(
     Raises:
         SSHError: If SSH command fails or is not available
     """
-    logger = get_logger()
+    logger = get_logger().bind("mtr.ssh")
     mode_str = "interactive" if tty else "batch"
-    logger.info(f"Executing {mode_str} command via SSH: {command}", module="mtr.ssh")
-    logger.debug(f"Host: {host}, User: {user}, Port: {port}, TTY: {tty}", module="mtr.ssh")
+    logger.info("Executing %s command via SSH: %s", mode_str, command)
+    logger.debug("Host: %s, User: %s, Port: %s, TTY: %s", host, user, port, tty)
 
     # Check SSH availability
     _check_ssh_availability()
@@ -92,7 +136,7 @@ def run_ssh_command(
 
     # Build the full command
     full_command = _build_command(command, workdir, pre_cmd)
-    logger.debug(f"Full command: {full_command}", module="mtr.ssh")
+    logger.debug("Full command: %s", full_command)
 
     # Build SSH command
     ssh_cmd = ["ssh"]
@@ -101,6 +145,17 @@ def run_ssh_command(
     if tty:
         ssh_cmd.append("-t")
 
+    if compress:
+        ssh_cmd.append("-C")
+
+    # Detect dead connections on long-running commands; OpenSSH already sets TCP_NODELAY for TTY sessions
+    ssh_cmd.extend(["-o", "ServerAliveInterval=30"])
+
+    # Reuse the connection opened by rsync (password auth via sshpass is not multiplexed)
+    use_password = password and not key_filename
+    if not use_password and ensure_control_dir():
+        ssh_cmd.extend(control_master_options())
+
     # Port
     if port != 22:
         ssh_cmd.extend(["-p", str(port)])
@@ -114,19 +169,19 @@ def run_ssh_command(
     ssh_cmd.extend([target, full_command])
 
     # Wrap with sshpass if password is provided
-    if password and not key_filename:
+    if use_password:
         ssh_cmd = ["sshpass", "-p", password] + ssh_cmd
 
-    logger.debug(f"Executing: {' '.join(ssh_cmd)}", module="mtr.ssh")
+    logger.debug("Executing: %s", " ".join(ssh_cmd))
 
     # Run command
     try:
         result = subprocess.run(ssh_cmd)
-        logger.info(f"Command exited with code: {result.returncode}", module="mtr.ssh")
+        logger.info("Command exited with code: %s", result.returncode)
         return result.returncode
     except FileNotFoundError as e:
-        logger.error(f"Command not found: {e}", module="mtr.ssh")
+        logger.error("Command not found: %s", e)
         raise SSHError(f"SSH command execution failed: {e}")
     except Exception as e:
-        logger.error(f"SSH command failed: {e}", module="mtr.ssh")
+        logger.error("SSH command failed: %s", e)
         raise SSHError(f"SSH command failed: {e}")
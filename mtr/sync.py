@@ -1,15 +1,76 @@
+import copy
 import os
+import re
 import shlex
-import shutil
 import subprocess
+import tempfile
+import weakref
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from mtr.ssh import _which, control_master_options, ensure_control_dir
+
+# Read size for rsync progress output
+_PROGRESS_CHUNK_SIZE = 65536
+# rsync status/summary lines that are not file names
+_PROGRESS_SKIP_PREFIXES = (b"sent", b"total", b"receiving", b"building")
+# rsync flags by (show_progress, compress). --partial keeps partially transferred files so an
+# interrupted transfer of a large file resumes with the delta algorithm.
+_RSYNC_FLAGS = {
+    (False, True): ("-azq", "--partial"),
+    (False, False): ("-aq", "--partial"),
+    (True, True): ("-avz", "--info=NAME", "--partial"),
+    (True, False): ("-av", "--info=NAME", "--partial"),
+}
+# Version banner, e.g. b"rsync  version 3.2.5  protocol version 31"
+_RSYNC_VER_RE = re.compile(rb"version\s+(\d+)\.(\d+)\.(\d+)")
+# Above this many exclude patterns, pass them via --exclude-from instead of one --exclude each
+_EXCLUDE_FROM_THRESHOLD = 16
 
 
 class SyncError(Exception):
     pass
 
 
+def _remove_file(path: str):
+    """Remove path, ignoring errors (used to clean up temp files)."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _read_rsync_version(rsync_bin: str) -> tuple:
+    """Run ``<rsync_bin> --version`` and return (major, minor, patch)."""
+    try:
+        result = subprocess.run([rsync_bin, "--version"], capture_output=True, timeout=5)
+        if result.returncode != 0:
+            raise SyncError("Failed to check rsync version. Is rsync installed?")
+
+        # Parse version from first line, e.g., "rsync  version 3.2.5  protocol version 31"
+        first_line = result.stdout.split(b"\n", 1)[0]
+        match = _RSYNC_VER_RE.search(first_line)
+        if not match:
+            raise SyncError(f"Cannot parse rsync version from: {first_line.decode(errors='replace')}")
+
+        return tuple(map(int, match.groups()))
+    except FileNotFoundError:
+        raise SyncError("rsync not found. Please install rsync.")
+    except subprocess.TimeoutExpired:
+        raise SyncError("Timeout while checking rsync version.")
+    except Exception as e:
+        raise SyncError(f"Failed to check rsync version: {e}")
+
+
+class MultiHostSyncError(SyncError):
+    """Raised by RsyncSyncer.sync_many() when the sync failed on one or more hosts."""
+
+    def __init__(self, errors: Dict[str, Exception]):
+        self.errors = errors
+        details = "; ".join(f"{host}: {error}" for host, error in errors.items())
+        super().__init__(f"Sync failed on {len(errors)} host(s): {details}")
+
+
 class BaseSyncer(ABC):
     def __init__(self, local_dir: str, remote_dir: str, exclude: List[str], respect_gitignore: bool = True):
         self.local_dir = local_dir
@@ -23,6 +84,9 @@ class BaseSyncer(ABC):
 
 
 class RsyncSyncer(BaseSyncer):
+    # Parsed `rsync --version` per resolved rsync binary, shared by all instances in the process
+    _version_cache: Dict[str, tuple] = {}
+
     def __init__(
         self,
         local_dir: str,
@@ -34,6 +98,8 @@ class RsyncSyncer(BaseSyncer):
         port: int = 22,
         exclude: List[str] = None,
         respect_gitignore: bool = True,
+        compress: bool = True,
+        whole_file: bool = False,
     ):
         super().__init__(local_dir, remote_dir, exclude or [], respect_gitignore)
         self.host = host
@@ -41,22 +107,29 @@ class RsyncSyncer(BaseSyncer):
         self.key_filename = key_filename
         self.password = password
         self.port = port
+        self.compress = compress
+        self.whole_file = whole_file
+        self._exclude_file: Optional[str] = None
+        self._ssh_arg = self._build_ssh_options()
 
-    def _build_ssh_options(self) -> str:
+    def _build_ssh_options(self, multiplex: bool = True) -> str:
         """Build SSH options string for rsync."""
         opts = f"ssh -p {self.port}"
         if self.key_filename:
             opts += f" -i {self.key_filename}"
+        if multiplex and not self._uses_sshpass():
+            opts += " " + " ".join(control_master_options())
         return opts
 
     def _build_rsync_base(self, show_progress: bool = False) -> List[str]:
         """Build rsync base command with common options."""
-        if show_progress:
-            # In progress mode, use -av --info=NAME to show filenames only
-            cmd = ["rsync", "-av", "--info=NAME"]
-        else:
-            # Silent mode
-            cmd = ["rsync", "-azq"]
+        # Progress mode shows filenames only (-v --info=NAME); silent mode uses -q
+        cmd = ["rsync"]
+        cmd.extend(_RSYNC_FLAGS[bool(show_progress), bool(self.compress)])
+
+        # Skip the delta algorithm; on fast links sending whole files is cheaper than checksumming them
+        if self.whole_file:
+            cmd.append("--whole-file")
 
         # Add gitignore filter if enabled
         if self.respect_gitignore:
@@ -64,59 +137,75 @@ class RsyncSyncer(BaseSyncer):
             if os.path.exists(gitignore_path):
                 cmd.append("--filter=:- .gitignore")
 
-        # Add excludes
-        for item in self.exclude:
-            cmd.append(f"--exclude={item}")
+        # Add excludes; long lists go through a file to keep argv small
+        exclude_file = self._get_exclude_file()
+        if exclude_file:
+            cmd.append(f"--exclude-from={exclude_file}")
+        else:
+            cmd.extend(f"--exclude={item}" for item in self.exclude)
 
         # SSH options
-        cmd.extend(["-e", self._build_ssh_options()])
+        cmd.extend(("-e", self._ssh_arg))
 
         return cmd
 
+    def _get_exclude_file(self) -> Optional[str]:
+        """Return a temp file listing the exclude patterns, or None to pass them as --exclude args.
+
+        The file is written once per syncer, reused by later sync/download calls, and removed
+        when the syncer is garbage collected. Patterns starting with '#' or ';' would be read
+        as comments by --exclude-from, so such lists stay on the command line.
+        """
+        if len(self.exclude) <= _EXCLUDE_FROM_THRESHOLD:
+            return None
+        if any(item.startswith(("#", ";")) for item in self.exclude):
+            return None
+        if self._exclude_file is None:
+            fd, path = tempfile.mkstemp(prefix="mtr-exclude-", suffix=".txt")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("\n".join(self.exclude) + "\n")
+            weakref.finalize(self, _remove_file, path)
+            self._exclude_file = path
+        return self._exclude_file
+
+    def _prepare_multiplexing(self):
+        """Create the ControlMaster socket directory, or drop multiplexing from the ssh options if that fails."""
+        if not self._uses_sshpass() and not ensure_control_dir():
+            self._ssh_arg = self._build_ssh_options(multiplex=False)
+
+    def _uses_sshpass(self) -> bool:
+        """Whether password authentication through sshpass is used."""
+        return bool(self.password and not self.key_filename)
+
     def _wrap_with_sshpass(self, cmd: List[str]) -> List[str]:
         """Wrap command with sshpass if password authentication is used."""
-        if self.password and not self.key_filename:
+        if self._uses_sshpass():
             return ["sshpass", "-p", self.password] + cmd
         return cmd
 
     def _check_sshpass(self):
         """Check if sshpass is available when password authentication is used."""
-        if self.password and not self.key_filename:
-            if not shutil.which("sshpass"):
+        if self._uses_sshpass():
+            if not _which("sshpass"):
                 raise SyncError("Rsync with password requires 'sshpass'. Please install it or use SSH Key.")
 
     def _check_rsync_version(self) -> tuple:
         """Check local rsync version and return (major, minor, patch) tuple.
 
+        The result is cached per rsync binary for the lifetime of the process; failures are not
+        cached, so installing rsync mid-run is picked up.
+
         Returns:
             Tuple of (major, minor, patch) version numbers
         Raises:
             SyncError: If rsync is not installed or version cannot be parsed
         """
-        try:
-            result = subprocess.run(["rsync", "--version"], capture_output=True, text=True, timeout=5)
-            if result.returncode != 0:
-                raise SyncError("Failed to check rsync version. Is rsync installed?")
-
-            # Parse version from first line, e.g., "rsync  version 3.2.5  protocol version 31"
-            first_line = result.stdout.split("\n")[0]
-            import re
-
-            match = re.search(r"version\s+(\d+)\.(\d+)\.(\d+)", first_line)
-            if not match:
-                # Try alternative format: "rsync version 2.6.9 compatible"
-                match = re.search(r"version\s+(\d+)\.(\d+)\.(\d+)", first_line)
-                if not match:
-                    raise SyncError(f"Cannot parse rsync version from: {first_line}")
-
-            major, minor, patch = int(match.group(1)), int(match.group(2)), int(match.group(3))
-            return (major, minor, patch)
-        except FileNotFoundError:
-            raise SyncError("rsync not found. Please install rsync.")
-        except subprocess.TimeoutExpired:
-            raise SyncError("Timeout while checking rsync version.")
-        except Exception as e:
-            raise SyncError(f"Failed to check rsync version: {e}")
+        rsync_bin = _which("rsync") or "rsync"
+        version = self._version_cache.get(rsync_bin)
+        if version is None:
+            version = _read_rsync_version(rsync_bin)
+            self._version_cache[rsync_bin] = version
+        return version
 
     def _is_rsync_version_supported(self, min_version: tuple = (3, 1, 0)) -> bool:
         """Check if local rsync version meets minimum requirement.
@@ -145,13 +234,57 @@ class RsyncSyncer(BaseSyncer):
 
     def _build_rsync_download_command(self, remote_path: str, local_path: str, show_progress: bool = False) -> List[str]:
         """Build rsync command for downloading (remote -> local)."""
-        src = f"{self.user}@{self.host}:{shlex.quote(remote_path)}"
+        return self._build_rsync_download_many_command([remote_path], local_path, show_progress=show_progress)
 
+    def _build_rsync_download_many_command(
+        self, remote_paths: List[str], local_path: str, show_progress: bool = False
+    ) -> List[str]:
+        """Build one rsync command downloading several remote paths (remote -> local).
+
+        With more than one source, ``local_path`` must be a directory.
+        """
         cmd = self._build_rsync_base(show_progress=show_progress)
-        cmd.extend([src, local_path])
+        cmd.extend(f"{self.user}@{self.host}:{shlex.quote(path)}" for path in remote_paths)
+        cmd.append(local_path)
 
         return self._wrap_with_sshpass(cmd)
 
+    def _run_rsync(self, cmd: List[str], error_prefix: str, show_progress: bool = False, progress_callback=None):
+        """Run an rsync command, optionally reporting transferred files to progress_callback."""
+        try:
+            if show_progress and progress_callback:
+                # Run with real-time output parsing for progress display.
+                # Read raw bytes in large chunks and split lines ourselves: --info=NAME can emit
+                # thousands of lines per second, and only reported lines are decoded.
+                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0)
+
+                pending = b""
+                while True:
+                    chunk = process.stdout.read(_PROGRESS_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    *lines, pending = (pending + chunk).split(b"\n")
+                    self._report_progress(lines, progress_callback)
+                self._report_progress([pending], progress_callback)
+
+                process.wait()
+                if process.returncode != 0:
+                    raise SyncError(f"{error_prefix} failed with exit code {process.returncode}")
+            else:
+                # Silent mode - use subprocess.run
+                subprocess.run(cmd, check=True)
+        except subprocess.CalledProcessError as e:
+            raise SyncError(f"{error_prefix} failed with exit code {e.returncode}")
+
+    @staticmethod
+    def _report_progress(lines: List[bytes], progress_callback):
+        """Pass file names from rsync output lines to progress_callback, skipping status lines."""
+        for line in lines:
+            line = line.strip()
+            # Skip empty lines and summary lines; rsync --info=NAME outputs filenames directly
+            if line and not line.startswith(_PROGRESS_SKIP_PREFIXES):
+                progress_callback(line.decode("utf-8", errors="replace"))
+
     def sync(self, show_progress: bool = False, progress_callback=None):
         self._check_sshpass()
 
@@ -165,66 +298,106 @@ class RsyncSyncer(BaseSyncer):
                     f"Please upgrade rsync or use --no-tty mode."
                 )
 
+        self._prepare_multiplexing()
         cmd = self._build_rsync_command(show_progress=show_progress)
 
-        try:
-            if show_progress and progress_callback:
-                # Run with real-time output parsing for progress display
-                process = subprocess.Popen(
-                    cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, universal_newlines=True
-                )
+        self._run_rsync(cmd, "Rsync", show_progress=show_progress, progress_callback=progress_callback)
 
-                # Parse rsync output line by line
-                for line in process.stdout:
-                    line = line.strip()
-                    # Skip empty lines and summary lines
-                    if line and not line.startswith("sent") and not line.startswith("total"):
-                        # Extract filename from rsync output
-                        # Rsync --info=NAME outputs filenames directly
-                        if not line.startswith("receiving") and not line.startswith("building"):
-                            progress_callback(line)
+    def sync_many(self, hosts: List[str], max_workers: int = 8):
+        """Sync the local tree to several hosts concurrently.
 
-                process.wait()
-                if process.returncode != 0:
-                    raise SyncError(f"Rsync failed with exit code {process.returncode}")
-            else:
-                # Silent mode - use subprocess.run
-                subprocess.run(cmd, check=True)
-        except subprocess.CalledProcessError as e:
-            raise SyncError(f"Rsync failed with exit code {e.returncode}")
+        Every host gets a copy of this syncer's settings with ``host`` replaced. All hosts are
+        attempted; failures are collected and raised together as a MultiHostSyncError.
+        The default ``max_workers`` stays below sshd's default MaxStartups of 10.
+        """
+        # Imported lazily: concurrent.futures pulls in threading/queue, and the CLI never syncs to several hosts
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        # Write the exclude file (if any) once so all copies share it
+        self._get_exclude_file()
+
+        errors: Dict[str, Exception] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self._for_host(host).sync): host for host in hosts}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except SyncError as e:
+                    errors[futures[future]] = e
+
+        if errors:
+            raise MultiHostSyncError({host: errors[host] for host in hosts if host in errors})
+
+    def _for_host(self, host: str) -> "RsyncSyncer":
+        """Return a copy of this syncer targeting ``host``."""
+        syncer = copy.copy(self)
+        syncer.host = host
+        return syncer
+
+    def close(self):
+        """Shut down the multiplexed SSH master for this host, if one is running.
+
+        Masters otherwise exit on their own after ControlPersist; call this to tear the
+        connection down deterministically. Errors (e.g. no master running) are ignored.
+        """
+        if self._uses_sshpass():
+            return  # Password authentication never multiplexes
+        cmd = ["ssh", "-O", "exit", "-p", str(self.port)] + control_master_options()
+        cmd.append(f"{self.user}@{self.host}")
+        try:
+            subprocess.run(cmd, capture_output=True, timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
 
     def download(self, remote_path: str, local_path: str, show_progress: bool = False, progress_callback=None):
         """Download file or directory from remote to local."""
-        self._check_sshpass()
+        self._download_batches([([remote_path], local_path)], show_progress, progress_callback)
 
-        # Ensure local parent directory exists
-        local_dir = os.path.dirname(local_path)
-        if local_dir and not os.path.exists(local_dir):
-            os.makedirs(local_dir, exist_ok=True)
+    @staticmethod
+    def _group_downloads(pairs: List[Tuple[str, str]]) -> List[Tuple[List[str], str]]:
+        """Group (remote_path, local_path) pairs into (remote_paths, local_dest) rsync batches.
 
-        cmd = self._build_rsync_download_command(remote_path, local_path, show_progress=show_progress)
-        try:
-            if show_progress and progress_callback:
-                # Run with real-time output parsing for progress display
-                process = subprocess.Popen(
-                    cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, universal_newlines=True
-                )
+        Pairs whose local path is ``<dir>/<basename of remote path>`` are grouped by ``<dir>`` and
+        always fetched into ``<dir>/``, even when alone in their group, so the result for a pair does
+        not depend on its siblings. Other pairs (renamed targets, and remote paths with a trailing
+        slash, whose contents rather than the directory itself are copied) get a batch of their own
+        with the exact destination. Batches are ordered by first appearance.
+        """
+        batches: List[Tuple[List[str], str]] = []
+        by_dir: Dict[str, List[str]] = {}
+        for remote_path, local_path in pairs:
+            name = os.path.basename(remote_path)
+            if not name or os.path.basename(local_path) != name:
+                batches.append(([remote_path], local_path))
+                continue
+            local_dir = os.path.dirname(local_path)
+            if local_dir not in by_dir:
+                by_dir[local_dir] = []
+                batches.append((by_dir[local_dir], os.path.join(local_dir or ".", "")))
+            by_dir[local_dir].append(remote_path)
+        return batches
+
+    def download_many(self, pairs: List[Tuple[str, str]], show_progress: bool = False, progress_callback=None):
+        """Download several (remote_path, local_path) pairs from remote to local.
+
+        Pairs landing in the same local directory under their remote name are fetched with a
+        single rsync invocation (``rsync host:src1 host:src2 dir/``), so they cost one SSH session
+        instead of one each; other pairs are downloaded one by one. Unlike download(), a remote
+        directory ``src`` paired with ``dir/src`` always lands at ``dir/src`` (merging into an
+        existing directory there), whether or not other pairs share ``dir``.
+        """
+        self._download_batches(self._group_downloads(pairs), show_progress, progress_callback)
+
+    def _download_batches(self, batches: List[Tuple[List[str], str]], show_progress: bool, progress_callback):
+        """Run one rsync download per (remote_paths, local_path) batch."""
+        self._check_sshpass()
+        self._prepare_multiplexing()
 
-                # Parse rsync output line by line
-                for line in process.stdout:
-                    line = line.strip()
-                    # Skip empty lines and summary lines
-                    if line and not line.startswith("sent") and not line.startswith("total"):
-                        # Extract filename from rsync output
-                        # Rsync --info=NAME outputs filenames directly
-                        if not line.startswith("receiving") and not line.startswith("building"):
-                            progress_callback(line)
+        for remote_paths, local_path in batches:
+            # Ensure local parent directory exists
+            local_dir = os.path.dirname(local_path)
+            if local_dir and not os.path.exists(local_dir):
+                os.makedirs(local_dir, exist_ok=True)
 
-                process.wait()
-                if process.returncode != 0:
-                    raise SyncError(f"Rsync download failed with exit code {process.returncode}")
-            else:
-                # Silent mode - use subprocess.run
-                subprocess.run(cmd, check=True)
-        except subprocess.CalledProcessError as e:
-            raise SyncError(f"Rsync download failed with exit code {e.returncode}")
+            cmd = self._build_rsync_download_many_command(remote_paths, local_path, show_progress=show_progress)
+            self._run_rsync(cmd, "Rsync download", show_progress=show_progress, progress_callback=progress_callback)
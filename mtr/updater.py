@@ -1,11 +1,14 @@
 """Update checker for mtr-cli."""
 
+import functools
 import json
 import os
-import urllib.request
-from datetime import datetime, timedelta
+import subprocess
+import sys
+import tempfile
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from packaging import version
 
@@ -14,43 +17,86 @@ from mtr import __version__
 PYPI_API_URL = "https://pypi.org/pypi/mtr-cli/json"
 CACHE_DIR = Path.home() / ".cache" / "mtr"
 CACHE_FILE = CACHE_DIR / "update_cache.json"
+# A background check holding this lock younger than this is assumed to still be running
+BACKGROUND_LOCK_TIMEOUT_SECONDS = 60
 CHECK_INTERVAL_HOURS = 24
 
 
+def _env_disables_update_check() -> bool:
+    """Whether MTR_DISABLE_UPDATE_CHECK is set to a truthy value."""
+    return os.environ.get("MTR_DISABLE_UPDATE_CHECK", "").lower() in ("1", "true", "yes")
+
+
+# Evaluated once at import; the environment does not change during a CLI run
+_DISABLED = _env_disables_update_check()
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_version(version_str: str) -> version.Version:
+    """Cached version.parse(); the same few version strings are parsed on every run."""
+    return version.parse(version_str)
+
+
 class UpdateChecker:
     """Check for updates from PyPI."""
 
     def __init__(self, current_version: str = __version__):
-        self.current_version = version.parse(current_version)
+        self.current_version = _parse_version(current_version)
         self.cache_file = CACHE_FILE
+        # Parsed cache contents, memoized per process as (cache_file, data)
+        self._cache: Optional[Tuple[Path, dict]] = None
+        # ETag of the last PyPI response, saved with the check result for conditional requests
+        self._etag: Optional[str] = None
 
     def _ensure_cache_dir(self) -> None:
         """Ensure cache directory exists."""
         self.cache_file.parent.mkdir(parents=True, exist_ok=True)
 
     def _load_cache(self) -> dict:
-        """Load cache from file."""
-        if not self.cache_file.exists():
-            return {}
+        """Load cache from file, reading it at most once per process."""
+        if self._cache is not None and self._cache[0] == self.cache_file:
+            return self._cache[1]
+
         try:
-            with open(self.cache_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
+            data = json.loads(self.cache_file.read_bytes())
+        except (ValueError, OSError):
+            data = {}  # Missing, unreadable or corrupt cache
+        self._cache = (self.cache_file, data)
+        return data
 
     def _save_cache(self, data: dict) -> None:
-        """Save cache to file."""
+        """Save cache to file (write-through: later loads in this process reuse ``data``).
+
+        The file is replaced atomically, so a concurrent reader (another mtr process, or the
+        background check racing this one) never sees a partially written cache.
+        """
+        self._cache = (self.cache_file, data)
+        payload = json.dumps(data).encode("utf-8")
         self._ensure_cache_dir()
+        tmp_path = None
         try:
-            with open(self.cache_file, "w") as f:
-                json.dump(data, f)
-        except IOError:
-            pass  # Silently fail if we can't write cache
+            # mkstemp creates the file with mode 0o600 under a unique name, so concurrent writers don't collide
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_file.parent, prefix=".update_cache.", suffix=".tmp")
+            try:
+                # Raw os.write: the payload is already bytes, no buffered file object needed
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view) :]
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, self.cache_file)
+        except OSError:
+            # Silently fail if we can't write cache
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
 
     def should_check(self) -> bool:
         """Check if we should perform an update check."""
         # Check if disabled via environment variable
-        if os.environ.get("MTR_DISABLE_UPDATE_CHECK", "").lower() in ("1", "true", "yes"):
+        if _DISABLED:
             return False
 
         cache = self._load_cache()
@@ -59,19 +105,46 @@ class UpdateChecker:
         if not last_check:
             return True
 
-        try:
-            last_check_time = datetime.fromisoformat(last_check)
-            next_check_time = last_check_time + timedelta(hours=CHECK_INTERVAL_HOURS)
-            return datetime.now() >= next_check_time
-        except ValueError:
+        if isinstance(last_check, str):
+            # Caches written by older versions store an ISO-8601 string
+            from datetime import datetime
+
+            try:
+                last_check = datetime.fromisoformat(last_check).timestamp()
+            except ValueError:
+                return True
+        elif not isinstance(last_check, (int, float)):
             return True
 
+        return time.time() - last_check >= CHECK_INTERVAL_HOURS * 3600
+
     def get_latest_version(self) -> Optional[str]:
-        """Fetch latest version from PyPI."""
+        """Fetch latest version from PyPI.
+
+        Sends the cached ETag as If-None-Match; on 304 Not Modified the cached version is
+        returned without downloading or decoding the release JSON.
+        """
+        # Imported lazily: urllib.request pulls in http.client/ssl/email and is only needed once a day
+        import urllib.error
+        import urllib.request
+
+        cache = self._load_cache()
+        cached_version = cache.get("latest_version")
+        headers = {}
+        if cached_version and cache.get("pypi_etag"):
+            headers["If-None-Match"] = cache["pypi_etag"]
+        request = urllib.request.Request(PYPI_API_URL, headers=headers)
+
         try:
-            with urllib.request.urlopen(PYPI_API_URL, timeout=5) as response:
+            with urllib.request.urlopen(request, timeout=5) as response:
                 data = json.loads(response.read().decode("utf-8"))
+                self._etag = response.headers.get("ETag")
                 return data["info"]["version"]
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached_version:
+                self._etag = cache["pypi_etag"]
+                return cached_version
+            return None
         except Exception:
             return None
 
@@ -88,22 +161,101 @@ class UpdateChecker:
 
         # Save check result regardless of success (to avoid hammering PyPI on failures)
         cache_data = {
-            "last_check_time": datetime.now().isoformat(),
+            "last_check_time": time.time(),
             "current_version": str(self.current_version),
         }
 
         if latest_version_str:
             cache_data["latest_version"] = latest_version_str
+            if self._etag:
+                cache_data["pypi_etag"] = self._etag
             self._save_cache(cache_data)
 
-            latest = version.parse(latest_version_str)
-            if latest > self.current_version:
+            if self._is_newer(latest_version_str):
                 return self._format_update_message(latest_version_str)
         else:
             self._save_cache(cache_data)
 
         return None
 
+    def _lock_file(self) -> Path:
+        """Lock file marking a running background check."""
+        return self.cache_file.with_name("update_check.lock")
+
+    def _acquire_background_lock(self) -> bool:
+        """Create the background-check lock file.
+
+        Returns False if another check holds a fresh lock or the cache directory is unusable.
+        """
+        try:
+            self._ensure_cache_dir()
+        except OSError:
+            return False
+        lock_file = self._lock_file()
+        for _ in range(2):
+            try:
+                fd = os.open(lock_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                try:
+                    if time.time() - lock_file.stat().st_mtime < BACKGROUND_LOCK_TIMEOUT_SECONDS:
+                        return False
+                    lock_file.unlink()  # Stale lock left by a killed check
+                except OSError:
+                    return False
+                continue
+            except OSError:
+                return False
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return True
+        return False
+
+    def _release_background_lock(self) -> None:
+        """Remove the background-check lock file."""
+        try:
+            self._lock_file().unlink()
+        except OSError:
+            pass
+
+    def check_in_background(self) -> bool:
+        """Run the update check in a detached ``python -m mtr.updater`` process.
+
+        The check survives the CLI exiting right after a short command. Nothing is spawned when
+        no check is due, another background check is running, or the cache directory cannot be
+        created; this method never raises.
+
+        Returns:
+            True if a background check was started.
+        """
+        if not self.should_check() or not self._acquire_background_lock():
+            return False
+        try:
+            subprocess.Popen(
+                [sys.executable, "-m", "mtr.updater", "--background-check"],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=True,
+                start_new_session=True,
+                # -m puts the working directory first on sys.path; run from the cache dir so the
+                # user's project can't shadow mtr or its dependencies in the child
+                cwd=str(self.cache_file.parent),
+            )
+        except OSError:
+            self._release_background_lock()
+            return False
+        return True
+
+    def _is_newer(self, version_str: str) -> bool:
+        """Whether version_str is a valid version newer than the running one.
+
+        Invalid values (e.g. a hand-edited or corrupt cache) count as not newer instead of raising.
+        """
+        try:
+            return _parse_version(str(version_str)) > self.current_version
+        except version.InvalidVersion:
+            return False
+
     def _format_update_message(self, latest_version: str) -> str:
         """Format update message."""
         return (
@@ -123,8 +275,22 @@ class UpdateChecker:
         latest_version_str = cache.get("latest_version")
 
         if latest_version_str:
-            latest = version.parse(latest_version_str)
-            if latest > self.current_version:
+            if self._is_newer(latest_version_str):
                 return self._format_update_message(latest_version_str)
 
         return None
+
+
+def _background_check_main() -> None:
+    """Entry point of the detached process started by UpdateChecker.check_in_background()."""
+    checker = UpdateChecker()
+    try:
+        checker.check()
+    except Exception:
+        pass  # Silently fail update check
+    finally:
+        checker._release_background_lock()
+
+
+if __name__ == "__main__" and "--background-check" in sys.argv[1:]:
+    _background_check_main()
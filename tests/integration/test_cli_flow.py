@@ -1,4 +1,5 @@
 import os
+import shlex
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -55,6 +56,7 @@ def test_mtr_flow(mock_components):
         assert call_kwargs["user"] == "testuser"
         assert call_kwargs["command"] == "python train.py"
         assert call_kwargs["workdir"] == "/remote"
+        assert call_kwargs["compress"] is False
 
 
 def test_mtr_init(tmp_path):
@@ -75,3 +77,49 @@ def test_mtr_init(tmp_path):
             content = f.read()
             assert "MTRemote Configuration" in content
             assert "dev-node" in content
+
+
+def test_mtr_dry_run_skips_remote_work(mock_components, mocker):
+    """Test that --dry-run neither checks for updates, syncs nor runs the command."""
+    config_cls, sync_cls = mock_components
+
+    mock_config_instance = MagicMock()
+    mock_config_instance.target_server = "gpu-01"
+    mock_config_instance.server_config = {"host": "1.2.3.4", "user": "testuser", "remote_dir": "/remote"}
+    mock_config_instance.global_defaults = {"exclude": []}
+    config_cls.return_value.load.return_value = mock_config_instance
+
+    checker_cls = mocker.patch("mtr.cli.UpdateChecker")
+    mock_ssh = mocker.patch("mtr.cli.run_ssh_command")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--dry-run", "python", "train.py"])
+
+    assert result.exit_code == 0
+    assert "[DryRun] Would sync" in result.output
+    assert "[DryRun] Would run on 1.2.3.4: python train.py" in result.output
+    checker_cls.assert_not_called()
+    sync_cls.return_value.sync.assert_not_called()
+    mock_ssh.assert_not_called()
+
+
+def test_mtr_command_quoting(mock_components, mocker):
+    """Test that multi-argument commands are shell-quoted and single snippets pass verbatim."""
+    config_cls, _ = mock_components
+
+    mock_config_instance = MagicMock()
+    mock_config_instance.target_server = "gpu-01"
+    mock_config_instance.server_config = {"host": "1.2.3.4", "user": "testuser", "remote_dir": "/remote"}
+    mock_config_instance.global_defaults = {"exclude": []}
+    config_cls.return_value.load.return_value = mock_config_instance
+
+    mock_ssh = mocker.patch("mtr.cli.run_ssh_command", return_value=0)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["--no-sync", "--no-check-update", "--", "python3", "-c", "print('hello world')"])
+    assert result.exit_code == 0
+    assert mock_ssh.call_args.kwargs["command"] == shlex.join(["python3", "-c", "print('hello world')"])
+
+    result = runner.invoke(cli, ["--no-sync", "--no-check-update", "make && ./run"])
+    assert result.exit_code == 0
+    assert mock_ssh.call_args.kwargs["command"] == "make && ./run"
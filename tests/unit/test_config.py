@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 import yaml
 
@@ -133,3 +135,41 @@ def test_respect_gitignore_server_override(tmp_path):
     # Server without override should use global default (True)
     config2 = loader.load(server_name="node-2")
     assert config2.get_respect_gitignore() is True
+
+
+def test_config_cache_written_and_reused(sample_config_yaml):
+    """Test that a JSON sidecar cache is written and used while the YAML is unchanged."""
+    cache_file = sample_config_yaml.parent / "config.cache.json"
+    loader = ConfigLoader(config_path=str(sample_config_yaml))
+    loader.load()
+    assert cache_file.exists()
+
+    # Second load must not parse YAML again
+    with patch("mtr.config.yaml.load", side_effect=AssertionError("YAML parsed")):
+        config = ConfigLoader(config_path=str(sample_config_yaml)).load()
+
+    assert config.target_server == "gpu-01"
+    assert config.server_config["host"] == "192.168.1.10"
+
+
+def test_config_cache_invalidated_on_change(sample_config_yaml):
+    """Test that editing the YAML file invalidates the sidecar cache."""
+    loader = ConfigLoader(config_path=str(sample_config_yaml))
+    assert loader.load().server_config["host"] == "192.168.1.10"
+
+    config_content = {"servers": {"node-1": {"host": "3.3.3.3"}}}
+    with open(sample_config_yaml, "w") as f:
+        yaml.dump(config_content, f)
+
+    config = loader.load()
+    assert config.target_server == "node-1"
+    assert config.server_config["host"] == "3.3.3.3"
+
+
+def test_config_cache_corrupt_falls_back_to_yaml(sample_config_yaml):
+    """Test that a corrupt sidecar cache is ignored."""
+    cache_file = sample_config_yaml.parent / "config.cache.json"
+    cache_file.write_text("not json")
+
+    config = ConfigLoader(config_path=str(sample_config_yaml)).load()
+    assert config.target_server == "gpu-01"
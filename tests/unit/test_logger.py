@@ -56,6 +56,49 @@ class TestLogger:
             assert "[test_module]" in content
             assert "test message" in content
 
+    def test_lazy_format_args(self):
+        """Test that %-style args are formatted into the message."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = os.path.join(tmpdir, "test.log")
+            logger = Logger(log_file, LogLevel.DEBUG)
+
+            logger.info("copied %s -> %s", "a.txt", "b.txt", module="test_module")
+
+            with open(log_file, "r") as f:
+                content = f.read()
+
+            assert "[test_module] copied a.txt -> b.txt" in content
+
+    def test_lazy_format_skipped_when_filtered(self):
+        """Test that args are not formatted for filtered-out levels."""
+
+        class Explosive:
+            def __str__(self):
+                raise AssertionError("formatted a filtered message")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = os.path.join(tmpdir, "test.log")
+            logger = Logger(log_file, LogLevel.INFO)
+
+            logger.debug("value: %s", Explosive())
+
+            assert not os.path.exists(log_file)
+
+    def test_bound_logger_tags_module(self):
+        """Test that a bound logger adds its module and respects the level."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = os.path.join(tmpdir, "test.log")
+            logger = Logger(log_file, LogLevel.INFO).bind("mtr.ssh")
+
+            logger.debug("hidden %s", "debug")
+            logger.info("exit code: %s", 0)
+
+            with open(log_file, "r") as f:
+                content = f.read()
+
+            assert "[INFO] [mtr.ssh] exit code: 0" in content
+            assert "hidden" not in content
+
 
 class TestNoOpLogger:
     """Test cases for _NoOpLogger class."""
@@ -70,6 +113,13 @@ class TestNoOpLogger:
         logger.warning("test")
         logger.error("test")
 
+    def test_no_op_logger_bind(self):
+        """Test that binding a module to _NoOpLogger returns the no-op logger."""
+        logger = _NoOpLogger()
+
+        assert logger.bind("mtr.ssh") is logger
+        logger.bind("mtr.ssh").info("test %s", "arg")
+
     def test_no_op_logger_with_module(self):
         """Test that _NoOpLogger accepts module parameter."""
         logger = _NoOpLogger()
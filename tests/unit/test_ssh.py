@@ -4,7 +4,15 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from mtr.ssh import SSHError, _build_command
+from mtr.ssh import SSHError, _build_command, _which, ensure_control_dir, run_ssh_command
+
+
+@pytest.fixture(autouse=True)
+def clear_which_cache():
+    """Reset the cached PATH lookups between tests."""
+    _which.cache_clear()
+    yield
+    _which.cache_clear()
 
 
 def test_build_command():
@@ -23,3 +31,89 @@ def test_build_command():
         _build_command("python app.py", workdir="/app", pre_cmd="source venv/bin/activate")
         == "cd /app && source venv/bin/activate && python app.py"
     )
+
+
+def test_run_ssh_command_options(mocker):
+    """Test ssh argv construction for a key-authenticated TTY command."""
+    mocker.patch("mtr.ssh.shutil.which", return_value="/usr/bin/ssh")
+    mocker.patch("mtr.ssh.ensure_control_dir")
+    mock_run = mocker.patch("mtr.ssh.subprocess.run", return_value=Mock(returncode=0))
+
+    exit_code = run_ssh_command(
+        host="1.2.3.4",
+        user="dev",
+        command="ls",
+        port=2222,
+        key_filename="/keys/id_rsa",
+        workdir="/app",
+    )
+
+    assert exit_code == 0
+    ssh_cmd = mock_run.call_args.args[0]
+    assert ssh_cmd[0] == "ssh"
+    assert "-t" in ssh_cmd
+    assert "ServerAliveInterval=30" in ssh_cmd
+    assert ssh_cmd[ssh_cmd.index("-p") + 1] == "2222"
+    assert ssh_cmd[ssh_cmd.index("-i") + 1] == "/keys/id_rsa"
+    assert "ControlMaster=auto" in ssh_cmd
+    assert "-C" not in ssh_cmd
+    assert ssh_cmd[-2:] == ["dev@1.2.3.4", "cd /app && ls"]
+
+
+def test_run_ssh_command_password_not_multiplexed(mocker):
+    """Test that sshpass-wrapped commands do not use ControlMaster."""
+    mocker.patch("mtr.ssh.shutil.which", return_value="/usr/bin/found")
+    mock_run = mocker.patch("mtr.ssh.subprocess.run", return_value=Mock(returncode=3))
+
+    exit_code = run_ssh_command(host="h", user="u", command="ls", password="secret", tty=False)
+
+    assert exit_code == 3
+    ssh_cmd = mock_run.call_args.args[0]
+    assert ssh_cmd[:3] == ["sshpass", "-p", "secret"]
+    assert "-t" not in ssh_cmd
+    assert not any(opt.startswith("ControlMaster") for opt in ssh_cmd)
+
+
+def test_run_ssh_command_unusable_home_not_multiplexed(mocker, monkeypatch, tmp_path):
+    """Test that an uncreatable ControlMaster directory disables multiplexing instead of raising."""
+    home = tmp_path / "home"
+    home.write_text("")  # A file, so ~/.cache/mtr/cm cannot be created
+    monkeypatch.setenv("HOME", str(home))
+    mocker.patch("mtr.ssh.shutil.which", return_value="/usr/bin/ssh")
+    mock_run = mocker.patch("mtr.ssh.subprocess.run", return_value=Mock(returncode=0))
+
+    assert ensure_control_dir() is False
+    exit_code = run_ssh_command(host="h", user="u", command="ls", key_filename="k", tty=False)
+
+    assert exit_code == 0
+    ssh_cmd = mock_run.call_args.args[0]
+    assert not any(opt.startswith("Control") for opt in ssh_cmd)
+
+
+def test_which_is_cached(mocker):
+    """Test that repeated availability checks only probe PATH once."""
+    mock_which = mocker.patch("mtr.ssh.shutil.which", return_value="/usr/bin/ssh")
+
+    assert _which("ssh") == "/usr/bin/ssh"
+    assert _which("ssh") == "/usr/bin/ssh"
+
+    mock_which.assert_called_once_with("ssh")
+
+
+def test_missing_ssh_raises(mocker):
+    """Test that a missing ssh binary is reported as SSHError."""
+    mocker.patch("mtr.ssh.shutil.which", return_value=None)
+
+    with pytest.raises(SSHError, match="SSH command not found"):
+        run_ssh_command(host="h", user="u", command="ls")
+
+
+def test_run_ssh_command_compress(mocker):
+    """Test that compress=True enables SSH compression."""
+    mocker.patch("mtr.ssh.shutil.which", return_value="/usr/bin/ssh")
+    mocker.patch("mtr.ssh.ensure_control_dir")
+    mock_run = mocker.patch("mtr.ssh.subprocess.run", return_value=Mock(returncode=0))
+
+    run_ssh_command(host="h", user="u", command="journalctl", key_filename="k", compress=True)
+
+    assert "-C" in mock_run.call_args.args[0]
@@ -1,8 +1,19 @@
 import pytest
 
+from mtr.ssh import _which
 from mtr.sync import RsyncSyncer, SyncError
 
 
+@pytest.fixture(autouse=True)
+def clear_sync_caches():
+    """Each test patches subprocess.run / shutil.which itself, so start from empty caches."""
+    RsyncSyncer._version_cache.clear()
+    _which.cache_clear()
+    yield
+    RsyncSyncer._version_cache.clear()
+    _which.cache_clear()
+
+
 def test_rsync_command_generation():
     syncer = RsyncSyncer(
         local_dir="/local/project",
@@ -18,7 +29,7 @@ def test_rsync_command_generation():
 
     assert "rsync" in cmd_list[0]
     # Check for archive mode (silent mode uses -azq)
-    assert "-azq" in cmd_list or any(x.startswith("-") and "a" in x and "q" in x for x in cmd_list)
+    assert "-azq" in cmd_list
 
     # Check exclude
     assert "--exclude=.git" in cmd_list
@@ -37,6 +48,9 @@ def test_rsync_command_generation():
     ssh_cmd = cmd_list[e_index + 1]
     assert "ssh" in ssh_cmd
     assert "-i ~/.ssh/id_rsa" in ssh_cmd
+    # Connection is shared with the subsequent ssh command execution
+    assert "-o ControlMaster=auto" in ssh_cmd
+    assert "ControlPath=" in ssh_cmd
 
 
 def test_rsync_command_generation_with_progress():
@@ -53,13 +67,11 @@ def test_rsync_command_generation_with_progress():
     cmd_list = syncer._build_rsync_command(show_progress=True)
 
     assert "rsync" in cmd_list[0]
-    # Check for archive mode with verbose (progress mode uses -av --info=NAME)
-    assert "-av" in cmd_list or any(x.startswith("-") and "a" in x and "v" in x for x in cmd_list)
-    assert "--info=NAME" in cmd_list
+    # Progress mode: archive, verbose and compressed, filenames only
+    assert cmd_list[1:4] == ["-avz", "--info=NAME", "--partial"]
 
-    # Check that -q (quiet) is NOT in progress mode
-    assert "-azq" not in cmd_list
-    assert not any(x.startswith("-") and "q" in x for x in cmd_list)
+    # Check that -q (quiet) is NOT in progress mode: the only short options are -avz and -e
+    assert [x for x in cmd_list if x.startswith("-") and not x.startswith("--")] == ["-avz", "-e"]
 
     # Check exclude
     assert "--exclude=.git" in cmd_list
@@ -83,6 +95,8 @@ def test_rsync_with_sshpass(mocker):
     assert cmd[1] == "-p"
     assert cmd[2] == "password"
     assert "rsync" in cmd
+    # Password sessions are not multiplexed
+    assert "ControlMaster" not in cmd[cmd.index("-e") + 1]
 
 
 def test_rsync_missing_sshpass(mocker):
@@ -118,7 +132,7 @@ def test_rsync_download_command_generation():
 
     assert "rsync" in cmd_list[0]
     # Check for archive mode (silent mode uses -azq)
-    assert "-azq" in cmd_list or any(x.startswith("-") and "a" in x and "q" in x for x in cmd_list)
+    assert "-azq" in cmd_list
 
     # Check source (remote path with shlex.quote)
     expected_src = f"dev@192.168.1.1:{shlex.quote('/remote/file.txt')}"
@@ -151,13 +165,11 @@ def test_rsync_download_command_generation_with_progress():
     cmd_list = syncer._build_rsync_download_command("/remote/file.txt", "/local/file.txt", show_progress=True)
 
     assert "rsync" in cmd_list[0]
-    # Check for archive mode with verbose (progress mode uses -av --info=NAME)
-    assert "-av" in cmd_list or any(x.startswith("-") and "a" in x and "v" in x for x in cmd_list)
-    assert "--info=NAME" in cmd_list
+    # Progress mode: archive, verbose and compressed, filenames only
+    assert cmd_list[1:4] == ["-avz", "--info=NAME", "--partial"]
 
-    # Check that -q (quiet) is NOT in progress mode
-    assert "-azq" not in cmd_list
-    assert not any(x.startswith("-") and "q" in x for x in cmd_list)
+    # Check that -q (quiet) is NOT in progress mode: the only short options are -avz and -e
+    assert [x for x in cmd_list if x.startswith("-") and not x.startswith("--")] == ["-avz", "-e"]
 
     # Check source (remote path with shlex.quote)
     expected_src = f"dev@192.168.1.1:{shlex.quote('/remote/file.txt')}"
@@ -168,7 +180,7 @@ def test_rsync_version_check_supported(mocker):
     """Test rsync version check when version is supported (>= 3.1.0)."""
     mock_result = mocker.MagicMock()
     mock_result.returncode = 0
-    mock_result.stdout = "rsync  version 3.2.5  protocol version 31\n"
+    mock_result.stdout = b"rsync  version 3.2.5  protocol version 31\n"
     mocker.patch("subprocess.run", return_value=mock_result)
 
     syncer = RsyncSyncer(
@@ -187,7 +199,7 @@ def test_rsync_version_check_unsupported(mocker):
     """Test rsync version check when version is too old (< 3.1.0)."""
     mock_result = mocker.MagicMock()
     mock_result.returncode = 0
-    mock_result.stdout = "rsync  version 2.6.9  protocol version 29\n"
+    mock_result.stdout = b"rsync  version 2.6.9  protocol version 29\n"
     mocker.patch("subprocess.run", return_value=mock_result)
 
     syncer = RsyncSyncer(
@@ -224,7 +236,7 @@ def test_rsync_sync_with_old_version_shows_error(mocker):
     # Mock version check to return old version
     mock_result = mocker.MagicMock()
     mock_result.returncode = 0
-    mock_result.stdout = "rsync  version 2.6.9  protocol version 29\n"
+    mock_result.stdout = b"rsync  version 2.6.9  protocol version 29\n"
     mocker.patch("subprocess.run", return_value=mock_result)
 
     syncer = RsyncSyncer(
@@ -364,5 +376,271 @@ def test_rsync_gitignore_with_progress_mode(tmp_path):
     # Check that gitignore filter is included in progress mode
     assert "--filter=:- .gitignore" in cmd_list
     # Check progress mode flags
-    assert "-av" in cmd_list or any(x.startswith("-") and "a" in x and "v" in x for x in cmd_list)
+    assert "-avz" in cmd_list
     assert "--info=NAME" in cmd_list
+
+
+def test_rsync_download_many_batches_shared_directory(mocker, tmp_path):
+    """Downloads into one directory are fetched with a single rsync call."""
+    mocker.patch("mtr.sync.ensure_control_dir")
+    mock_run = mocker.patch("subprocess.run")
+
+    syncer = RsyncSyncer(
+        local_dir="/local/project",
+        remote_dir="/remote/project",
+        host="192.168.1.1",
+        user="dev",
+        key_filename="~/.ssh/id_rsa",
+    )
+
+    names = ["a.log", "b.log", "c.log"]
+    syncer.download_many([(f"/remote/logs/{name}", str(tmp_path / "out" / name)) for name in names])
+
+    assert mock_run.call_count == 1
+    cmd_list = mock_run.call_args[0][0]
+    for name in names:
+        assert f"dev@192.168.1.1:/remote/logs/{name}" in cmd_list
+    assert cmd_list[-1] == str(tmp_path / "out") + "/"
+    assert (tmp_path / "out").is_dir()
+
+
+def test_rsync_download_many_falls_back_per_pair(mocker, tmp_path):
+    """Pairs that rename files or target different directories are downloaded one by one."""
+    mocker.patch("mtr.sync.ensure_control_dir")
+    mock_run = mocker.patch("subprocess.run")
+
+    syncer = RsyncSyncer(
+        local_dir="/local/project",
+        remote_dir="/remote/project",
+        host="192.168.1.1",
+        user="dev",
+        key_filename="~/.ssh/id_rsa",
+    )
+
+    syncer.download_many(
+        [
+            ("/remote/a.txt", str(tmp_path / "renamed.txt")),
+            ("/remote/ckpt/", str(tmp_path / "ckpt")),
+        ]
+    )
+
+    assert mock_run.call_count == 2
+    assert mock_run.call_args_list[0][0][0][-1] == str(tmp_path / "renamed.txt")
+    assert mock_run.call_args_list[1][0][0][-1] == str(tmp_path / "ckpt")
+
+
+def test_rsync_transfer_options():
+    """compress=False drops -z; whole_file=True skips the delta algorithm."""
+    syncer = RsyncSyncer(
+        local_dir="/local/project",
+        remote_dir="/remote/project",
+        host="192.168.1.1",
+        user="dev",
+        key_filename="~/.ssh/id_rsa",
+        compress=False,
+        whole_file=True,
+    )
+
+    cmd_list = syncer._build_rsync_command()
+    assert "-aq" in cmd_list
+    assert "--whole-file" in cmd_list
+
+    cmd_list = syncer._build_rsync_command(show_progress=True)
+    assert "-av" in cmd_list
+    assert "--whole-file" in cmd_list
+
+
+def test_rsync_version_is_cached(mocker):
+    """rsync --version runs once per process, not on every progress-mode sync."""
+    mock_result = mocker.Mock()
+    mock_result.returncode = 0
+    mock_result.stdout = b"rsync  version 3.2.7  protocol version 31\n"
+    mock_run = mocker.patch("subprocess.run", return_value=mock_result)
+
+    syncer = RsyncSyncer(local_dir="/local", remote_dir="/remote", host="h", user="u")
+    assert syncer._check_rsync_version() == (3, 2, 7)
+    assert syncer._is_rsync_version_supported()
+    # Shared across instances
+    other = RsyncSyncer(local_dir="/local", remote_dir="/remote", host="h2", user="u")
+    assert other._check_rsync_version() == (3, 2, 7)
+
+    assert mock_run.call_count == 1
+
+
+def test_rsync_version_failure_not_cached(mocker):
+    """A missing rsync is re-checked on the next call instead of being remembered."""
+    mock_result = mocker.Mock()
+    mock_result.returncode = 0
+    mock_result.stdout = b"rsync  version 3.2.7  protocol version 31\n"
+    mocker.patch("subprocess.run", side_effect=[FileNotFoundError(), mock_result])
+
+    syncer = RsyncSyncer(local_dir="/local", remote_dir="/remote", host="h", user="u")
+    with pytest.raises(SyncError, match="rsync not found"):
+        syncer._check_rsync_version()
+    assert syncer._check_rsync_version() == (3, 2, 7)
+
+
+def test_rsync_progress_parses_chunked_output(mocker):
+    """Progress output is split into lines across chunk boundaries and status lines are skipped."""
+    mocker.patch("mtr.sync.ensure_control_dir")
+    process = mocker.Mock()
+    process.stdout.read.side_effect = [
+        b"building file list ... done\nsrc/ma",
+        b"in.py\nsrc/util.py\n\nsent 1,024 bytes  received 35 bytes\n",
+        b"total size is 2,048",
+        b"",
+    ]
+    process.returncode = 0
+    mock_popen = mocker.patch("subprocess.Popen", return_value=process)
+
+    syncer = RsyncSyncer(local_dir="/local", remote_dir="/remote", host="h", user="u", key_filename="~/.ssh/id_rsa")
+    reported = []
+    syncer.download("/remote/src", "/tmp/src", show_progress=True, progress_callback=reported.append)
+
+    assert reported == ["src/main.py", "src/util.py"]
+    assert mock_popen.call_args.kwargs["bufsize"] == 0
+
+
+def test_rsync_many_excludes_use_exclude_from():
+    """Long exclude lists are written once to a file passed with --exclude-from."""
+    import gc
+    import os
+
+    patterns = [f"build_{i}/" for i in range(20)]
+    syncer = RsyncSyncer(local_dir="/local", remote_dir="/remote", host="h", user="u", exclude=patterns)
+
+    cmd_list = syncer._build_rsync_command()
+    assert not any(x.startswith("--exclude=") for x in cmd_list)
+    exclude_args = [x for x in cmd_list if x.startswith("--exclude-from=")]
+    assert len(exclude_args) == 1
+    path = exclude_args[0].split("=", 1)[1]
+    with open(path) as f:
+        assert f.read().splitlines() == patterns
+
+    # Reused across calls, removed with the syncer
+    assert exclude_args[0] in syncer._build_rsync_download_command("/remote/a", "/local/a")
+    del syncer
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_rsync_keeps_partial_files():
+    """Interrupted transfers leave partial files behind for the next run to resume."""
+    syncer = RsyncSyncer(local_dir="/local", remote_dir="/remote", host="h", user="u")
+
+    assert "--partial" in syncer._build_rsync_command()
+    assert "--partial" in syncer._build_rsync_download_command("/remote/a", "/local/a", show_progress=True)
+
+
+def test_rsync_sync_many_aggregates_errors(mocker):
+    """sync_many() syncs every host and reports all failures together."""
+    import subprocess
+
+    from mtr.sync import MultiHostSyncError
+
+    mocker.patch("mtr.sync.ensure_control_dir")
+
+    def fake_run(cmd, check):
+        if any(arg.startswith("dev@bad-") for arg in cmd):
+            raise subprocess.CalledProcessError(255, cmd)
+
+    mock_run = mocker.patch("subprocess.run", side_effect=fake_run)
+
+    syncer = RsyncSyncer(
+        local_dir="/local/project",
+        remote_dir="/remote/project",
+        host="unused",
+        user="dev",
+        key_filename="~/.ssh/id_rsa",
+    )
+
+    hosts = ["good-1", "bad-1", "good-2", "bad-2"]
+    with pytest.raises(MultiHostSyncError) as exc_info:
+        syncer.sync_many(hosts)
+
+    assert mock_run.call_count == len(hosts)
+    targets = {cmd[-1] for cmd in (call.args[0] for call in mock_run.call_args_list)}
+    assert targets == {f"dev@{host}:/remote/project" for host in hosts}
+    assert list(exc_info.value.errors) == ["bad-1", "bad-2"]
+    assert "exit code 255" in str(exc_info.value)
+    assert syncer.host == "unused"
+
+
+def test_rsync_download_many_groups_by_directory(mocker, tmp_path):
+    """Five files for one directory take one rsync call; a renamed target gets its own."""
+    mocker.patch("mtr.sync.ensure_control_dir")
+    mock_run = mocker.patch("subprocess.run")
+
+    syncer = RsyncSyncer(
+        local_dir="/local/project",
+        remote_dir="/remote/project",
+        host="192.168.1.1",
+        user="dev",
+        key_filename="~/.ssh/id_rsa",
+    )
+
+    pairs = [(f"/remote/ckpt/epoch_{i}.pt", str(tmp_path / "ckpt" / f"epoch_{i}.pt")) for i in range(5)]
+    pairs.insert(2, ("/remote/train.log", str(tmp_path / "last.log")))
+    syncer.download_many(pairs)
+
+    assert mock_run.call_count == 2
+    batch_cmd, single_cmd = (call.args[0] for call in mock_run.call_args_list)
+    assert batch_cmd[-1] == str(tmp_path / "ckpt") + "/"
+    assert sum(arg.startswith("dev@192.168.1.1:/remote/ckpt/") for arg in batch_cmd) == 5
+    assert single_cmd[-2:] == ["dev@192.168.1.1:/remote/train.log", str(tmp_path / "last.log")]
+
+
+def test_rsync_close_exits_control_master(mocker):
+    """close() asks the master on the shared ControlPath to exit; password auth has none."""
+    mock_run = mocker.patch("subprocess.run")
+
+    syncer = RsyncSyncer(
+        local_dir="/local", remote_dir="/remote", host="192.168.1.1", user="dev", port=2222, key_filename="~/.ssh/id_rsa"
+    )
+    ssh_cmd = syncer._build_rsync_command()[-3]
+    control_path = next(opt for opt in ssh_cmd.split() if opt.startswith("ControlPath="))
+
+    syncer.close()
+
+    cmd = mock_run.call_args.args[0]
+    assert cmd[:3] == ["ssh", "-O", "exit"]
+    assert control_path in cmd
+    assert cmd[cmd.index("-p") + 1] == "2222"
+    assert cmd[-1] == "dev@192.168.1.1"
+
+    mock_run.reset_mock()
+    RsyncSyncer(local_dir="/local", remote_dir="/remote", host="h", user="u", password="pw").close()
+    mock_run.assert_not_called()
+
+
+def test_rsync_download_many_destination_independent_of_siblings(mocker, tmp_path):
+    """A pair targeting an existing local directory gets the same destination alone or grouped."""
+    mocker.patch("mtr.sync.ensure_control_dir")
+    mock_run = mocker.patch("subprocess.run")
+    (tmp_path / "out" / "ckpt").mkdir(parents=True)
+
+    syncer = RsyncSyncer(local_dir="/local", remote_dir="/remote", host="h", user="u", key_filename="~/.ssh/id_rsa")
+    ckpt = ("/r/ckpt", str(tmp_path / "out" / "ckpt"))
+
+    syncer.download_many([ckpt])
+    syncer.download_many([ckpt, ("/r/log.txt", str(tmp_path / "out" / "log.txt"))])
+
+    alone, grouped = (call.args[0] for call in mock_run.call_args_list)
+    assert alone[-1] == grouped[-1] == str(tmp_path / "out") + "/"
+    assert "u@h:/r/ckpt" in alone and "u@h:/r/ckpt" in grouped
+
+
+def test_rsync_unusable_control_dir_disables_multiplexing(mocker):
+    """Without a ControlMaster socket directory, rsync runs without the ControlMaster options."""
+    mocker.patch("mtr.sync.ensure_control_dir", return_value=False)
+    mock_run = mocker.patch("subprocess.run")
+
+    syncer = RsyncSyncer(local_dir="/local", remote_dir="/remote", host="h", user="u", key_filename="~/.ssh/id_rsa")
+    syncer.sync()
+    syncer.download("/remote/a.txt", "/tmp/a.txt")
+
+    for call in mock_run.call_args_list:
+        cmd = call.args[0]
+        ssh_arg = cmd[cmd.index("-e") + 1]
+        assert "-i ~/.ssh/id_rsa" in ssh_arg
+        assert "Control" not in ssh_arg
@@ -1,13 +1,17 @@
 """Tests for mtr.updater module."""
 
+import json
 import os
+import subprocess
+import time
+import urllib.error
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from mtr.updater import CHECK_INTERVAL_HOURS, PYPI_API_URL, UpdateChecker
+from mtr.updater import CHECK_INTERVAL_HOURS, PYPI_API_URL, UpdateChecker, _env_disables_update_check, _parse_version
 
 
 @pytest.fixture
@@ -34,6 +38,8 @@ class TestGetLatestVersion:
         mock_response_data = b'{"info": {"version": "0.4.0"}}'
 
         class MockResponse:
+            headers = {}
+
             def read(self):
                 return mock_response_data
 
@@ -47,7 +53,43 @@ class TestGetLatestVersion:
             result = updater.get_latest_version()
 
             assert result == "0.4.0"
-            mock_urlopen.assert_called_once_with(PYPI_API_URL, timeout=5)
+            mock_urlopen.assert_called_once()
+            request = mock_urlopen.call_args.args[0]
+            assert request.full_url == PYPI_API_URL
+            assert request.get_header("If-none-match") is None
+            assert mock_urlopen.call_args.kwargs == {"timeout": 5}
+
+    def test_get_latest_version_304_uses_cache(self, updater):
+        """Test that a 304 Not Modified answer reuses the cached version and ETag."""
+        updater._save_cache({"latest_version": "0.4.0", "pypi_etag": '"abc"'})
+        not_modified = urllib.error.HTTPError(PYPI_API_URL, 304, "Not Modified", None, None)
+
+        with patch("urllib.request.urlopen", side_effect=not_modified) as mock_urlopen:
+            result = updater.get_latest_version()
+
+            assert result == "0.4.0"
+            assert mock_urlopen.call_args.args[0].get_header("If-none-match") == '"abc"'
+            assert updater._etag == '"abc"'
+
+    def test_check_saves_etag(self, updater):
+        """Test that the ETag of a successful response is stored for the next check."""
+
+        class MockResponse:
+            headers = {"ETag": '"v2"'}
+
+            def read(self):
+                return b'{"info": {"version": "0.4.0"}}'
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+        with patch("urllib.request.urlopen", return_value=MockResponse()):
+            updater.check()
+
+        assert updater._load_cache()["pypi_etag"] == '"v2"'
 
     def test_get_latest_version_failure(self, updater):
         """Test graceful handling of network failure."""
@@ -85,8 +127,8 @@ class TestShouldCheck:
     def test_should_check_after_interval(self, updater):
         """Test that check is performed after interval has passed."""
         # Create cache with old check time
-        old_time = datetime.now() - timedelta(hours=CHECK_INTERVAL_HOURS + 1)
-        cache_data = {"last_check_time": old_time.isoformat()}
+        old_time = time.time() - (CHECK_INTERVAL_HOURS + 1) * 3600
+        cache_data = {"last_check_time": old_time}
 
         updater._save_cache(cache_data)
 
@@ -95,28 +137,40 @@ class TestShouldCheck:
     def test_should_not_check_within_interval(self, updater):
         """Test that check is not performed within interval."""
         # Create cache with recent check time
-        recent_time = datetime.now() - timedelta(hours=CHECK_INTERVAL_HOURS - 1)
-        cache_data = {"last_check_time": recent_time.isoformat()}
+        recent_time = time.time() - (CHECK_INTERVAL_HOURS - 1) * 3600
+        cache_data = {"last_check_time": recent_time}
 
         updater._save_cache(cache_data)
 
         assert updater.should_check() is False
 
-    def test_should_check_disabled_via_env(self, updater):
-        """Test that check can be disabled via environment variable."""
-        with patch.dict(os.environ, {"MTR_DISABLE_UPDATE_CHECK": "1"}):
-            assert updater.should_check() is False
+    def test_should_check_legacy_iso_time(self, updater):
+        """Test that ISO-8601 check times written by older versions are still honoured."""
+        recent_time = datetime.now() - timedelta(hours=CHECK_INTERVAL_HOURS - 1)
+        updater._save_cache({"last_check_time": recent_time.isoformat()})
+        assert updater.should_check() is False
 
-    def test_should_check_disabled_via_env_true(self, updater):
-        """Test that check can be disabled via environment variable with 'true'."""
-        with patch.dict(os.environ, {"MTR_DISABLE_UPDATE_CHECK": "true"}):
-            assert updater.should_check() is False
+        old_time = datetime.now() - timedelta(hours=CHECK_INTERVAL_HOURS + 1)
+        updater._save_cache({"last_check_time": old_time.isoformat()})
+        assert updater.should_check() is True
 
-    def test_should_check_disabled_via_env_yes(self, updater):
-        """Test that check can be disabled via environment variable with 'yes'."""
-        with patch.dict(os.environ, {"MTR_DISABLE_UPDATE_CHECK": "yes"}):
+    def test_should_check_disabled(self, updater):
+        """Test that check is skipped when disabled via environment variable."""
+        with patch("mtr.updater._DISABLED", True):
             assert updater.should_check() is False
 
+    @pytest.mark.parametrize("value", ["1", "true", "yes", "TRUE"])
+    def test_env_disables_update_check(self, value):
+        """Test the accepted values of MTR_DISABLE_UPDATE_CHECK."""
+        with patch.dict(os.environ, {"MTR_DISABLE_UPDATE_CHECK": value}):
+            assert _env_disables_update_check() is True
+
+    @pytest.mark.parametrize("value", ["", "0", "false", "no"])
+    def test_env_does_not_disable_update_check(self, value):
+        """Test that other values leave the update check enabled."""
+        with patch.dict(os.environ, {"MTR_DISABLE_UPDATE_CHECK": value}):
+            assert _env_disables_update_check() is False
+
     def test_should_check_invalid_cache_time(self, updater):
         """Test that check is performed if cache time is invalid."""
         cache_data = {"last_check_time": "invalid-time-format"}
@@ -124,10 +178,6 @@ class TestShouldCheck:
 
         assert updater.should_check() is True
 
-
-class TestCheck:
-    """Tests for check method."""
-
     def test_check_no_update_available(self, updater):
         """Test that no message is returned when no update is available."""
         with patch.object(updater, "get_latest_version", return_value="0.3.0"):
@@ -159,7 +209,7 @@ class TestCheck:
             updater.check()
 
             cache = updater._load_cache()
-            assert "last_check_time" in cache
+            assert isinstance(cache["last_check_time"], float)
             assert cache["latest_version"] == "0.4.0"
             assert cache["current_version"] == "0.3.0"
 
@@ -174,12 +224,70 @@ class TestCheck:
 
     def test_check_skips_if_disabled(self, updater):
         """Test that check is skipped if disabled via environment variable."""
-        with patch.dict(os.environ, {"MTR_DISABLE_UPDATE_CHECK": "1"}):
+        with patch("mtr.updater._DISABLED", True):
             with patch.object(updater, "get_latest_version") as mock_get:
                 updater.check()
                 mock_get.assert_not_called()
 
 
+class TestCheckInBackground:
+    """Tests for check_in_background method."""
+
+    def test_spawns_detached_process(self, updater):
+        """Test that the check runs in a detached child process, started only once while it runs."""
+        with patch("mtr.updater.subprocess.Popen") as mock_popen:
+            assert updater.check_in_background() is True
+            assert updater.check_in_background() is False
+
+        mock_popen.assert_called_once()
+        args, kwargs = mock_popen.call_args
+        assert args[0][1:] == ["-m", "mtr.updater", "--background-check"]
+        assert kwargs["start_new_session"] is True
+        assert kwargs["stdin"] == kwargs["stdout"] == kwargs["stderr"] == subprocess.DEVNULL
+        assert kwargs["cwd"] == str(updater.cache_file.parent)
+        assert updater._lock_file().exists()
+
+    def test_stale_lock_is_replaced(self, updater):
+        """Test that a lock left by a killed check does not block new checks forever."""
+        updater._ensure_cache_dir()
+        lock_file = updater._lock_file()
+        lock_file.write_text("12345")
+        old = time.time() - 3600
+        os.utime(lock_file, (old, old))
+
+        with patch("mtr.updater.subprocess.Popen") as mock_popen:
+            assert updater.check_in_background() is True
+
+        mock_popen.assert_called_once()
+
+    def test_not_spawned_when_check_not_due(self, updater):
+        """Test that no process is spawned within the check interval."""
+        updater._save_cache({"last_check_time": time.time()})
+
+        with patch("mtr.updater.subprocess.Popen") as mock_popen:
+            assert updater.check_in_background() is False
+
+        mock_popen.assert_not_called()
+
+    def test_unwritable_cache_dir(self, updater, tmp_path):
+        """Test that an unusable cache directory skips the check instead of raising."""
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        updater.cache_file = blocker / "mtr" / "update_cache.json"
+
+        with patch("mtr.updater.subprocess.Popen") as mock_popen:
+            assert updater.check_in_background() is False
+
+        mock_popen.assert_not_called()
+
+    def test_spawn_failure_releases_lock(self, updater):
+        """Test that the lock is released if the process cannot be started."""
+        with patch("mtr.updater.subprocess.Popen", side_effect=OSError("no python")):
+            assert updater.check_in_background() is False
+
+        assert not updater._lock_file().exists()
+
+
 class TestGetCachedUpdateMessage:
     """Tests for get_cached_update_message method."""
 
@@ -191,7 +299,7 @@ class TestGetCachedUpdateMessage:
     def test_get_cached_message_update_available(self, updater):
         """Test that message is returned from cache when update is available."""
         cache_data = {
-            "last_check_time": datetime.now().isoformat(),
+            "last_check_time": time.time(),
             "latest_version": "0.4.0",
             "current_version": "0.3.0",
         }
@@ -205,7 +313,7 @@ class TestGetCachedUpdateMessage:
     def test_get_cached_message_no_update(self, updater):
         """Test that None is returned when cached version is not newer."""
         cache_data = {
-            "last_check_time": datetime.now().isoformat(),
+            "last_check_time": time.time(),
             "latest_version": "0.3.0",
             "current_version": "0.3.0",
         }
@@ -218,7 +326,7 @@ class TestGetCachedUpdateMessage:
     def test_get_cached_message_older_version(self, updater):
         """Test that None is returned when cached version is older."""
         cache_data = {
-            "last_check_time": datetime.now().isoformat(),
+            "last_check_time": time.time(),
             "latest_version": "0.2.0",
             "current_version": "0.3.0",
         }
@@ -228,6 +336,28 @@ class TestGetCachedUpdateMessage:
 
         assert result is None
 
+    def test_parsed_versions_are_cached(self, updater):
+        """Test that repeated lookups reuse the parsed version objects."""
+        updater._save_cache({"latest_version": "0.4.0"})
+        updater.get_cached_update_message()
+
+        hits = _parse_version.cache_info().hits
+        updater.get_cached_update_message()
+
+        assert _parse_version.cache_info().hits == hits + 1
+        assert UpdateChecker(current_version="0.3.0").current_version is updater.current_version
+
+    def test_get_cached_message_invalid_version(self, updater):
+        """Test that an unparsable cached version is ignored instead of raising."""
+        updater._save_cache({"latest_version": "not a version"})
+
+        assert updater.get_cached_update_message() is None
+
+    def test_check_invalid_remote_version(self, updater):
+        """Test that an unparsable version from PyPI does not raise."""
+        with patch.object(updater, "get_latest_version", return_value="not a version"):
+            assert updater.check() is None
+
 
 class TestFormatUpdateMessage:
     """Tests for _format_update_message method."""
@@ -271,6 +401,38 @@ class TestCacheOperations:
         result = updater._load_cache()
         assert result == {}
 
+    def test_load_cache_reads_file_once(self, updater):
+        """Test that the parsed cache is reused within a process."""
+        updater._ensure_cache_dir()
+        updater.cache_file.write_text('{"latest_version": "0.4.0"}')
+
+        with patch("mtr.updater.json.loads", wraps=json.loads) as mock_load:
+            assert updater._load_cache() == {"latest_version": "0.4.0"}
+            assert updater.get_cached_update_message() is not None
+            assert updater.should_check() is True
+
+            assert mock_load.call_count == 1
+
+    def test_save_cache_writes_through(self, updater):
+        """Test that saved data is served from memory and persisted to disk."""
+        updater._save_cache({"latest_version": "0.4.0"})
+
+        assert updater._load_cache() == {"latest_version": "0.4.0"}
+        assert json.loads(updater.cache_file.read_text()) == {"latest_version": "0.4.0"}
+
+    def test_save_cache_is_atomic(self, updater):
+        """Test that the cache is replaced via a temp file and no temp file is left behind."""
+        updater._save_cache({"latest_version": "0.4.0"})
+
+        with patch("mtr.updater.os.replace", wraps=os.replace) as mock_replace:
+            updater._save_cache({"latest_version": "0.5.0"})
+
+        mock_replace.assert_called_once()
+        assert mock_replace.call_args.args[1] == updater.cache_file
+        assert json.loads(updater.cache_file.read_text()) == {"latest_version": "0.5.0"}
+        assert [p.name for p in updater.cache_file.parent.iterdir()] == [updater.cache_file.name]
+        assert updater.cache_file.stat().st_mode & 0o777 == 0o600
+
     def test_save_cache_io_error(self, updater):
         """Test graceful handling of IO error when saving cache."""
         # Make cache file a directory to cause IO error